@@ -11,12 +11,7 @@ class MockAdBlockEngine : AdBlockEngine {
     
     override fun shouldBlock(url: String): Boolean {
         return if (blockingEnabled) {
-            url.contains("doubleclick") || 
-            url.contains("googleadservices") ||
-            url.contains("googlesyndication") ||
-            url.contains("google-analytics") ||
-            url.contains("facebook.com/tr") ||
-            url.contains("amazon-adsystem")
+            BLOCKED_PATTERN.containsMatchIn(url)
         } else {
             false
         }
@@ -56,4 +51,18 @@ class MockAdBlockEngine : AdBlockEngine {
     fun addAllowedUrl(url: String) {
         allowedUrls.add(url)
     }
+    
+    companion object {
+        private val BLOCKED_DOMAINS = listOf(
+            "doubleclick",
+            "googleadservices",
+            "googlesyndication",
+            "google-analytics",
+            "facebook.com/tr",
+            "amazon-adsystem"
+        )
+        
+        // Compiled once: a single scan per URL instead of one contains() per domain
+        private val BLOCKED_PATTERN = Regex(BLOCKED_DOMAINS.joinToString("|") { Regex.escape(it) })
+    }
 }
\ No newline at end of file
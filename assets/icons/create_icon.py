@@ -2,11 +2,28 @@
 """
 Create app icon for AdBlock in multiple sizes
 Uses a simple shield design with "Ad" text
+Requires: Pillow, NumPy (pip install -r requirements.txt)
+Pillow-SIMD can be installed in place of Pillow for faster resampling,
+see requirements.txt
 """
 
+import argparse
+import functools
+import hashlib
+import json
+import multiprocessing
 import os
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+@functools.lru_cache(maxsize=64)
+def _get_font(font_size):
+    """Load the icon font once per size, fallback to default if not available"""
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
+    except OSError:
+        return ImageFont.load_default()
+
 def create_shield_icon(size):
     """Create a shield-shaped icon with Ad text"""
     # Create a new image with transparent background
@@ -35,24 +52,27 @@ def create_shield_icon(size):
     ]
     
     # Draw gradient background (red to dark red)
-    for i in range(int(shield_height)):
-        color_value = int(220 - (i / shield_height) * 40)
-        temp_color = (color_value, 30, 30, 255)
-        y_offset = y1 + i
-        draw.line([(x1, y_offset), (x2, y_offset)], fill=temp_color, width=1)
+    # One RGBA pixel per row, broadcast across the width into a single
+    # buffer that PIL wraps without another copy, instead of one
+    # draw.line per row
+    rows = int(shield_height)
+    # Truncate like draw.line does, so the span covers the same pixels
+    cols = int(x2) - int(x1) + 1
+    row_colors = np.empty((rows, 4), dtype=np.uint8)
+    row_colors[:, 0] = (220 - np.arange(rows) / shield_height * 40).astype(np.uint8)
+    row_colors[:, 1:3] = 30
+    row_colors[:, 3] = 255
+    buf = np.broadcast_to(row_colors[:, np.newaxis, :], (rows, cols, 4)).tobytes()
+    gradient = Image.frombuffer('RGBA', (cols, rows), buf, 'raw', 'RGBA', 0, 1)
+    img.paste(gradient, (int(x1), int(y1)))
     
-    # Draw shield outline
-    draw.polygon(shield_points, fill=(200, 30, 30, 255))
-    draw.line(shield_points + [shield_points[0]], fill=(150, 20, 20, 255), width=int(size * 0.02))
+    # Draw shield with outline
+    draw.polygon(shield_points, fill=(200, 30, 30, 255),
+                 outline=(150, 20, 20, 255), width=int(size * 0.02))
     
     # Add "Ad" text
     text = "Ad"
-    # Try to use a bold font, fallback to default if not available
-    try:
-        font_size = int(size * 0.35)
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-    except:
-        font = ImageFont.load_default()
+    font = _get_font(int(size * 0.35))
     
     # Get text dimensions
     bbox = draw.textbbox((0, 0), text, font=font)
@@ -77,8 +97,58 @@ def create_shield_icon(size):
     
     return img
 
+MASTER_SIZE = 1024
+
+# Manifest of {filename: key} for icons written by previous runs.
+# Bump CACHE_VERSION whenever create_shield_icon's output changes.
+CACHE_FILE = '.icon.cache'
+CACHE_VERSION = 'v3'
+
+def _cache_key(size):
+    """Key identifying the inputs that determine an icon's pixels"""
+    return hashlib.sha256(f'{size}|Ad|helvetica|{CACHE_VERSION}'.encode()).hexdigest()[:12]
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+# Master icon shared with worker processes (set by _init_worker)
+_master = None
+
+def _init_worker(master):
+    """Receive the pre-rendered master once per worker process"""
+    global _master
+    _master = master
+
+def _render(task):
+    """Downscale the master to one size and save it"""
+    size, filename = task
+    if size == MASTER_SIZE:
+        # Full-size icons are shipped to the stores, so favour file size
+        icon = _master
+        compress_level = 6
+    else:
+        icon = _master.resize((size, size), Image.LANCZOS)
+        compress_level = 1
+    icon.save(filename, 'PNG', optimize=False, compress_level=compress_level)
+    return filename, size
+
 def main():
     """Generate icons in multiple sizes"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cpu-count', type=int, default=multiprocessing.cpu_count(),
+                        help='number of worker processes (default: all cores)')
+    parser.add_argument('--force', action='store_true',
+                        help='regenerate icons even if they are up to date')
+    args = parser.parse_args()
+    
     # Icon sizes needed for iOS and Android
     sizes = {
         # iOS App Icon sizes
@@ -104,27 +174,41 @@ def main():
     os.makedirs('ios', exist_ok=True)
     os.makedirs('android', exist_ok=True)
     
-    # Generate iOS icons
+    tasks = []
+    
+    # iOS icons
     for base_size, scale in sizes['ios']:
-        size = base_size * scale
-        icon = create_shield_icon(size)
-        filename = f'ios/icon-{base_size}@{scale}x.png'
-        icon.save(filename, 'PNG')
-        print(f'Created {filename} ({size}x{size})')
+        tasks.append((base_size * scale, f'ios/icon-{base_size}@{scale}x.png'))
     
-    # Generate Android icons
+    # Android icons
     density_names = ['mdpi', 'hdpi', 'xhdpi', 'xxhdpi', 'xxxhdpi', 'web']
     for i, (size, _) in enumerate(sizes['android']):
-        icon = create_shield_icon(size)
-        density = density_names[i]
-        filename = f'android/ic_launcher_{density}.png'
-        icon.save(filename, 'PNG')
-        print(f'Created {filename} ({size}x{size})')
-    
-    # Create a master icon
-    master = create_shield_icon(1024)
-    master.save('icon_master.png', 'PNG')
-    print('Created icon_master.png (1024x1024)')
+        tasks.append((size, f'android/ic_launcher_{density_names[i]}.png'))
+    
+    # Master icon
+    tasks.append((MASTER_SIZE, 'icon_master.png'))
+    
+    # Skip icons that already exist and were rendered from the same inputs
+    cache = {} if args.force else _load_cache()
+    pending = []
+    for size, filename in tasks:
+        if os.path.exists(filename) and cache.get(filename) == _cache_key(size):
+            print(f'Up to date {filename} ({size}x{size})')
+        else:
+            pending.append((size, filename))
+    
+    if not pending:
+        return
+    
+    # Render the master once; workers downscale and encode in parallel
+    master = create_shield_icon(MASTER_SIZE)
+    with multiprocessing.Pool(min(args.cpu_count, len(pending)), initializer=_init_worker,
+                              initargs=(master,)) as pool:
+        for filename, size in pool.imap_unordered(_render, pending):
+            cache[filename] = _cache_key(size)
+            print(f'Created {filename} ({size}x{size})')
+    
+    _save_cache(cache)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
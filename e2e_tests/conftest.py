@@ -0,0 +1,67 @@
+"""
+Session-wide YouTube block-rate gate for the pytest entry points.
+
+test_video_ads_blocked records each video's result here instead of failing on
+a single ad. Once every test has run, the combined block rate must reach the
+same 80% target run_full_test reports. Under pytest-xdist each worker sends
+its results to the controller, which applies the gate once.
+"""
+
+import pytest
+
+BLOCK_RATE_TARGET = 80
+
+video_results_key = pytest.StashKey()
+block_rate_key = pytest.StashKey()
+
+
+def _results(config):
+    return config.stash.setdefault(video_results_key, [])
+
+
+@pytest.fixture(scope="session")
+def video_results(request):
+    """List collecting {'ads_blocked', 'ads_shown'} dicts, one per loaded video"""
+    return _results(request.config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """xdist controller: merge the results a worker collected"""
+    _results(node.config).extend(getattr(node, "workeroutput", {}).get("video_results", []))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session, exitstatus):
+    results = _results(session.config)
+
+    # xdist worker: hand results to the controller instead of judging them
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["video_results"] = results
+        return
+
+    if not results:
+        return
+
+    # Same formula as YouTubeAdBlockTest.calculate_block_rate
+    ads_blocked = sum(r["ads_blocked"] for r in results)
+    ads_shown = sum(r["ads_shown"] for r in results)
+    total_ads = ads_blocked + ads_shown
+    block_rate = (ads_blocked / total_ads) * 100 if total_ads else 0
+
+    session.config.stash[block_rate_key] = (block_rate, ads_blocked, ads_shown, len(results))
+    if block_rate < BLOCK_RATE_TARGET and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if block_rate_key not in config.stash:
+        return
+    block_rate, ads_blocked, ads_shown, videos = config.stash[block_rate_key]
+    passed = block_rate >= BLOCK_RATE_TARGET
+    terminalreporter.section("YouTube block rate")
+    terminalreporter.line(
+        f"{'✅' if passed else '❌'} Block rate {block_rate:.1f}% over {videos} videos "
+        f"({ads_blocked} blocked, {ads_shown} shown), target {BLOCK_RATE_TARGET}%",
+        green=passed, red=not passed
+    )
@@ -5,56 +5,83 @@ Ensures the app stays under 30MB memory limit
 """
 
 import psutil
+import re
 import subprocess
 import time
 import os
 
+# Marks the end of each command's output on the persistent adb shell
+ADB_SENTINEL = b'===END==='
+
 class MemoryUsageTest:
     def __init__(self):
         self.max_memory_mb = 30
         self.measurements = []
+        # Matches both the "TOTAL <pss>" table row and the "TOTAL PSS: <pss>" summary
+        self._pss_re = re.compile(rb'TOTAL\s+(?:PSS:?\s+)?(\d+)')
+        
+    def _find_proc(self, process_name):
+        """Find the first process whose name contains process_name"""
+        return next(
+            (proc for proc in psutil.process_iter(['name'])
+             if process_name in (proc.info['name'] or '')),
+            None
+        )
         
     def get_process_memory(self, process_name):
         """Get memory usage of a process by name"""
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
-            if process_name in proc.info['name']:
-                memory_mb = proc.info['memory_info'].rss / 1024 / 1024
-                return memory_mb
-        return None
+        proc = self._find_proc(process_name)
+        if proc is None:
+            return None
+        try:
+            return proc.memory_info().rss / 1048576
+        except psutil.NoSuchProcess:
+            return None
+        
+    def _adb_shell_command(self, adb, command):
+        """Run a command in a persistent adb shell and return its output"""
+        adb.stdin.write(command.encode() + b'; echo ' + ADB_SENTINEL + b'\n')
+        adb.stdin.flush()
+        
+        output = []
+        for line in iter(adb.stdout.readline, b''):
+            if line.rstrip() == ADB_SENTINEL:
+                break
+            output.append(line)
+        return b''.join(output)
         
     def test_android_memory(self):
         """Test Android app memory usage"""
         print("Testing Android memory usage...")
         
-        # Start the app (assuming ADB is configured)
-        subprocess.run(["adb", "shell", "am", "start", "-n", "com.adblock/.MainActivity"])
-        time.sleep(5)  # Wait for app to start
-        
-        # Monitor memory for 60 seconds
-        for i in range(60):
-            # Get memory usage via ADB
-            result = subprocess.run(
-                ["adb", "shell", "dumpsys", "meminfo", "com.adblock"],
-                capture_output=True,
-                text=True
-            )
+        # One long-lived shell instead of spawning adb for every sample
+        adb = subprocess.Popen(
+            ["adb", "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        try:
+            # Start the app (assuming ADB is configured)
+            self._adb_shell_command(adb, "am start -n com.adblock/.MainActivity")
+            time.sleep(5)  # Wait for app to start
             
-            # Parse total PSS from output
-            for line in result.stdout.split('\n'):
-                if 'TOTAL' in line and 'PSS' in line:
-                    parts = line.split()
-                    for j, part in enumerate(parts):
-                        if part == 'TOTAL':
-                            try:
-                                memory_kb = int(parts[j+1])
-                                memory_mb = memory_kb / 1024
-                                self.measurements.append(memory_mb)
-                                print(f"   Memory at {i}s: {memory_mb:.2f} MB")
-                                break
-                            except:
-                                pass
-                                
-            time.sleep(1)
+            # Monitor memory for 60 seconds
+            for i in range(60):
+                # Get memory usage (-s prints only the summary)
+                output = self._adb_shell_command(adb, "dumpsys meminfo -s com.adblock")
+                
+                # Parse total PSS from output
+                match = self._pss_re.search(output)
+                if match:
+                    memory_kb = int(match.group(1))
+                    memory_mb = memory_kb / 1024
+                    self.measurements.append(memory_mb)
+                    print(f"   Memory at {i}s: {memory_mb:.2f} MB")
+                    
+                time.sleep(1)
+        finally:
+            adb.terminate()
+            adb.wait()
             
     def test_ios_memory(self):
         """Test iOS app memory usage"""
@@ -64,8 +91,19 @@ class MemoryUsageTest:
         # For simulation purposes:
         process_name = "AdBlock"
         
+        # Scan the process table once and then poll only that PID;
+        # re-scan if the process exits and is restarted
+        proc = self._find_proc(process_name)
+        
         for i in range(60):
-            memory = self.get_process_memory(process_name)
+            memory = None
+            if proc is None:
+                proc = self._find_proc(process_name)
+            if proc is not None:
+                try:
+                    memory = proc.memory_info().rss / 1048576
+                except psutil.NoSuchProcess:
+                    proc = None
             if memory:
                 self.measurements.append(memory)
                 print(f"   Memory at {i}s: {memory:.2f} MB")
@@ -4,16 +4,159 @@ E2E test for YouTube ad blocking functionality
 Tests actual blocking behavior using JavaScript injection
 """
 
+import argparse
+import base64
+import copy
+import functools
 import time
 import json
 import os
+import queue
+import shutil
+import socket
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import pytest
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.driver_cache import DriverCacheManager
+
+# Days a downloaded chromedriver is trusted before webdriver-manager re-checks
+CHROMEDRIVER_CACHE_DAYS = 30
+
+# Chromedriver path, resolved once per process
+_chromedriver_path = None
+
+def get_chromedriver_path():
+    """Locate chromedriver once, preferring $CHROMEDRIVER over webdriver-manager"""
+    global _chromedriver_path
+    if _chromedriver_path is None or not os.path.exists(_chromedriver_path):
+        path = os.environ.get('CHROMEDRIVER')
+        if not path or not os.path.exists(path):
+            cache_manager = DriverCacheManager(valid_range=CHROMEDRIVER_CACHE_DAYS)
+            path = ChromeDriverManager(cache_manager=cache_manager).install()
+        _chromedriver_path = path
+    return _chromedriver_path
+
+# Popular YouTube videos that typically have ads
+TEST_VIDEOS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",  # Popular video
+    "https://www.youtube.com/watch?v=9bZkp7q19f0",  # Music video
+    "https://www.youtube.com/watch?v=kJQP7kiw5Fk",  # Another popular video
+]
+
+# Test page that attempts to load ad resources
+AD_SERVER_TEST_HTML = """
+<!DOCTYPE html>
+<html>
+<head><title>Ad Server Test</title></head>
+<body>
+    <h1>Testing Ad Server Blocking</h1>
+    <div id="results"></div>
+    <script>
+        const adServers = [
+            'https://doubleclick.net/test',
+            'https://googleadservices.com/test',
+            'https://googlesyndication.com/test',
+            'https://google-analytics.com/test',
+            'https://facebook.com/tr',
+            'https://amazon-adsystem.com/test'
+        ];
+        
+        let blocked = 0;
+        let total = adServers.length;
+        
+        async function testBlocking() {
+            // Probe all servers at once rather than one after another.
+            // HEAD skips the response body; no-cors keeps a reachable
+            // server from being miscounted as blocked by a CORS failure.
+            const outcomes = await Promise.allSettled(
+                adServers.map(url => fetch(url, { method: 'HEAD', mode: 'no-cors' }))
+            );
+            outcomes.forEach((outcome, i) => {
+                if (outcome.status === 'rejected') {
+                    blocked++;
+                    console.log('Successfully blocked:', adServers[i]);
+                } else {
+                    console.log('Not blocked:', adServers[i]);
+                }
+            });
+            
+            document.getElementById('results').innerHTML = 
+                `Blocked: ${blocked}/${total} (${(blocked/total*100).toFixed(1)}%)`;
+            window.__testResults = { blocked, total };
+        }
+        
+        testBlocking();
+    </script>
+</body>
+</html>
+"""
+
+# The page is static, so its data URL is built once at import time
+AD_SERVER_TEST_URL = "data:text/html;base64," + base64.b64encode(AD_SERVER_TEST_HTML.encode()).decode()
+
+# Ad server hosts checked by the DNS-based test. Only whole-domain rules
+# belong here: path rules such as facebook.com/tr can only be checked by the
+# browser test, since a DNS sinkhole sees hostnames, not paths.
+AD_SERVER_HOSTS = [
+    'doubleclick.net',
+    'googleadservices.com',
+    'googlesyndication.com',
+    'google-analytics.com',
+    'scorecardresearch.com',
+    'amazon-adsystem.com'
+]
+
+# Addresses a DNS sinkhole answers with for blocked hosts
+SINKHOLE_ADDRESSES = {'0.0.0.0', '127.0.0.1', '::', '::1'}
+
+# Resolver answers meaning "no such host", as a blocker that refuses to
+# resolve ad hosts returns them. Anything else (EAI_AGAIN, EAI_FAIL, no
+# network) says nothing about blocking. EAI_NODATA is missing on macOS.
+BLOCKED_LOOKUP_ERRORS = {socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', socket.EAI_NONAME)}
+
+# Host that must resolve normally, so a broken resolver is not mistaken for
+# one that blocks everything
+DNS_CONTROL_HOST = 'www.youtube.com'
+
+# Elements YouTube only renders while an ad is playing
+AD_INDICATOR_SELECTOR = ".ytp-ad-skip-button, .ytp-ad-badge, .ytp-ad-duration-remaining"
+
+# Ad element classes checked for visibility after the page settles
+AD_ELEMENTS = {
+    'skip_button': "ytp-ad-skip-button",
+    'ad_badge': "ytp-ad-badge",
+    'ad_duration': "ytp-ad-duration-remaining",
+    'ad_text': "ytp-ad-text",
+    'overlay': "ytp-ad-overlay-container"
+}
+
+# Reads the blocking script's counters and returns the class of the first
+# visible AD_ELEMENTS match (passed as arguments[0]), or null if none is shown
+PAGE_REPORT_SCRIPT = """
+const classes = arguments[0];
+const selector = classes.map(c => '.' + c).join(', ');
+let visible = null;
+for (const e of document.querySelectorAll(selector)) {
+    if (e.offsetParent) {
+        visible = classes.find(c => e.classList.contains(c));
+        break;
+    }
+}
+const urls = window.__blockedUrls || [];
+return {
+    blocked: window.__adsBlocked || 0,
+    enabled: window.__adBlockEnabled || false,
+    urls: {count: urls.length, first: urls.slice(0, 5)},
+    visible: visible
+};
+"""
 
 class YouTubeAdBlockTest:
     def __init__(self):
@@ -21,24 +164,126 @@ class YouTubeAdBlockTest:
         self.ads_shown = 0
         self.videos_tested = 0
         self.blocked_domains = []
+        # Per-driver Chrome profile directories, removed in _quit_driver
+        self._profile_dirs = {}
+        # Shared browser, started by __enter__ and quit by __exit__
+        self.driver = None
+        
+    def __enter__(self):
+        self.driver = self._make_driver()
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.driver is not None:
+            self._quit_driver(self.driver)
+            self.driver = None
+        
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _build_options(cls):
+        """Chrome options shared by every driver, built once per process"""
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless=new')  # Use new headless mode
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--enable-logging')
+        options.add_argument('--v=1')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        # Skip image downloads and decoding; the checks only need the DOM
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2
+        })
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        # Return from driver.get at DOMContentLoaded; the explicit waits
+        # cover the player and ads instead of the full load event
+        options.page_load_strategy = 'eager'
+        return options
+        
+    def _make_driver(self):
+        """Start a headless Chrome with the blocking script installed"""
+        # Copy the cached options so per-driver arguments don't leak into it
+        options = copy.deepcopy(self._build_options())
+        
+        # Give every browser its own profile so parallel instances don't collide
+        profile_dir = tempfile.mkdtemp(prefix='chrome-')
+        options.add_argument(f'--user-data-dir={profile_dir}')
+        
+        service = Service(get_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=options)
+        self._profile_dirs[driver] = profile_dir
+        
+        # Inject ad blocking script before every page load for this session
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': self.get_blocking_script()
+        })
+        return driver
+        
+    def _quit_driver(self, driver):
+        """Quit a driver and remove its temporary profile"""
+        try:
+            driver.quit()
+        finally:
+            shutil.rmtree(self._profile_dirs.pop(driver, ''), ignore_errors=True)
         
     def get_blocking_script(self):
         """Get JavaScript to inject for ad blocking simulation"""
         # This simulates what our actual ad blocker would do
         return """
-        // Domains to block
-        const blockedDomains = [
+        // Hosts to block (subdomains included)
+        const blockedHosts = new Set([
             'doubleclick.net',
             'googleadservices.com',
             'googlesyndication.com',
             'google-analytics.com',
             'googletagmanager.com',
-            'facebook.com/tr',
-            'amazon-adsystem.com',
-            'youtube.com/api/stats/ads',
-            'youtube.com/pagead',
-            'googlevideo.com/ptracking'
-        ];
+            'amazon-adsystem.com'
+        ]);
+        
+        // Paths to block on otherwise allowed hosts
+        const blockedPaths = new Map([
+            ['facebook.com', ['/tr']],
+            ['youtube.com', ['/api/stats/ads', '/pagead']],
+            ['googlevideo.com', ['/ptracking']]
+        ]);
+        
+        // Parse the URL once, then probe each parent domain of the hostname
+        // with a Set/Map lookup instead of scanning the URL per domain
+        function isBlocked(url) {
+            let parsed;
+            try {
+                parsed = new URL(url, location.href);
+            } catch (e) {
+                return false;
+            }
+            let host = parsed.hostname;
+            while (true) {
+                if (blockedHosts.has(host)) {
+                    return true;
+                }
+                const paths = blockedPaths.get(host);
+                if (paths && paths.some(path => parsed.pathname.startsWith(path))) {
+                    return true;
+                }
+                const dot = host.indexOf('.');
+                if (dot < 0) {
+                    return false;
+                }
+                host = host.slice(dot + 1);
+            }
+        }
+        
+        // Blocked requests are recorded in-page so the test reads back only
+        // what it needs instead of ingesting the whole browser log
+        window.__blockedUrls = [];
+        function recordBlocked(kind, url) {
+            console.log('[AdBlock] Blocked ' + kind + ':', url);
+            window.__adsBlocked = (window.__adsBlocked || 0) + 1;
+            window.__blockedUrls.push(kind + ': ' + url);
+        }
         
         // Override XMLHttpRequest
         const originalXHR = window.XMLHttpRequest;
@@ -47,10 +292,9 @@ class YouTubeAdBlockTest:
             const originalOpen = xhr.open;
             
             xhr.open = function(method, url, ...args) {
-                const blocked = blockedDomains.some(domain => url.includes(domain));
+                const blocked = isBlocked(url);
                 if (blocked) {
-                    console.log('[AdBlock] Blocked XHR:', url);
-                    window.__adsBlocked = (window.__adsBlocked || 0) + 1;
+                    recordBlocked('XHR', url);
                     throw new Error('Blocked by AdBlock');
                 }
                 return originalOpen.call(this, method, url, ...args);
@@ -62,10 +306,9 @@ class YouTubeAdBlockTest:
         const originalFetch = window.fetch;
         window.fetch = function(url, ...args) {
             const urlStr = url.toString();
-            const blocked = blockedDomains.some(domain => urlStr.includes(domain));
+            const blocked = isBlocked(urlStr);
             if (blocked) {
-                console.log('[AdBlock] Blocked fetch:', urlStr);
-                window.__adsBlocked = (window.__adsBlocked || 0) + 1;
+                recordBlocked('fetch', urlStr);
                 return Promise.reject(new Error('Blocked by AdBlock'));
             }
             return originalFetch.call(this, url, ...args);
@@ -76,10 +319,9 @@ class YouTubeAdBlockTest:
             mutations.forEach((mutation) => {
                 mutation.addedNodes.forEach((node) => {
                     if (node.tagName === 'SCRIPT' && node.src) {
-                        const blocked = blockedDomains.some(domain => node.src.includes(domain));
+                        const blocked = isBlocked(node.src);
                         if (blocked) {
-                            console.log('[AdBlock] Blocked script:', node.src);
-                            window.__adsBlocked = (window.__adsBlocked || 0) + 1;
+                            recordBlocked('script', node.src);
                             node.remove();
                         }
                     }
@@ -96,179 +338,189 @@ class YouTubeAdBlockTest:
         window.__adBlockEnabled = true;
         """
         
-    def test_youtube_video(self, video_url):
-        """Test if ads are blocked on a specific YouTube video"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless=new')  # Use new headless mode
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+    def wait_for_ads_or_idle(self, driver, quiet_period=0.5, timeout=10):
+        """Wait until an ad indicator appears or no new resource entries
+        appear for quiet_period seconds, whichever comes first"""
+        state = {'count': -1, 'since': time.monotonic()}
         
-        # Use webdriver-manager to handle driver installation
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        try:
-            # Inject ad blocking script before page loads
-            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': self.get_blocking_script()
-            })
+        def ad_or_idle(d):
+            ad_shown, count = d.execute_script(
+                "return [!!document.querySelector(arguments[0]),"
+                " performance.getEntriesByType('resource').length];",
+                AD_INDICATOR_SELECTOR
+            )
+            if ad_shown:
+                return True
+            now = time.monotonic()
+            if count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+            return now - state['since'] >= quiet_period
             
-            # Load the page
-            driver.get(video_url)
-            
-            # Wait for video player to load
-            wait = WebDriverWait(driver, 15)
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(ad_or_idle)
+        except TimeoutException:
+            # Page never went quiet; measure what was loaded so far
+            pass
+        
+    def test_youtube_video(self, video_url, driver=None):
+        """Test if ads are blocked on a specific YouTube video
+        
+        Returns {'ads_blocked': n, 'ads_shown': n, 'enabled': bool}, or None
+        if the player never loaded. Counters on self are left to the caller.
+        """
+        driver = driver or self.driver
+        # Start each video from a clean session; the blocking script and its
+        # counters are re-initialised by the navigation itself
+        driver.delete_all_cookies()
+        
+        # Load the page
+        driver.get(video_url)
+        
+        # Wait for video player to load. find_elements returns [] while the
+        # player is missing, so polling does not raise NoSuchElementException
+        wait = WebDriverWait(driver, 15)
+        try:
+            wait.until(lambda d: d.find_elements(By.ID, "movie_player"))
+        except TimeoutException:
+            print(f"Timeout waiting for video player on {video_url}")
+            return None
+        
+        # Give ads a chance to load: stop as soon as one shows up or
+        # resource loading settles
+        self.wait_for_ads_or_idle(driver)
+        
+        # Collect everything from the page in a single round-trip: block
+        # counters, the first 5 blocked URLs and the first visible ad element
+        # (these should not appear if blocking works)
+        report = driver.execute_script(PAGE_REPORT_SCRIPT, list(AD_ELEMENTS.values()))
+        blocked_count = report['blocked']
+        adblock_enabled = report['enabled']
+        blocked_urls = report['urls']
+        
+        # Several indicators belong to the same ad, so a video with any
+        # visible indicator counts as one ad shown
+        visible_ads = 0
+        if report['visible']:
+            visible_ads = 1
+            name = next(n for n, c in AD_ELEMENTS.items() if c == report['visible'])
+            print(f"Warning: Ad element visible: {name}")
+        
+        if blocked_count > 0:
+            print(f"✓ Blocked {blocked_count} ad requests on {video_url}")
+        
+        if visible_ads > 0:
+            print(f"✗ {visible_ads} ads still visible on {video_url}")
+        else:
+            print(f"✓ No visible ads on {video_url}")
+        
+        # Log blocked URLs for debugging
+        if blocked_urls['count']:
+            print(f"  Blocked URLs: {blocked_urls['count']}")
+            for url in blocked_urls['first']:  # Show first 5
+                print(f"    - {url}")
+                
+        return {'ads_blocked': blocked_count, 'ads_shown': visible_ads,
+                'enabled': bool(adblock_enabled)}
+        
+    def test_youtube_videos(self, video_urls, max_workers=None):
+        """Test several videos concurrently, one Chrome instance per worker"""
+        workers = max(1, min(max_workers or len(video_urls), len(video_urls)))
+        
+        def run(video_url):
+            driver = drivers.get()
             try:
-                video_player = wait.until(
-                    EC.presence_of_element_located((By.ID, "movie_player"))
-                )
-            except TimeoutException:
-                print(f"Timeout waiting for video player on {video_url}")
-                return
-            
-            # Give time for ads to potentially load
-            time.sleep(5)
-            
-            # Check how many ads were blocked by our script
-            blocked_count = driver.execute_script("return window.__adsBlocked || 0")
-            adblock_enabled = driver.execute_script("return window.__adBlockEnabled || false")
-            
-            # Get console logs to see what was blocked
-            logs = driver.get_log('browser')
-            blocked_urls = []
-            for log in logs:
-                if '[AdBlock] Blocked' in log.get('message', ''):
-                    blocked_urls.append(log['message'])
-            
-            # Check for visible ad elements (these should not appear if blocking works)
-            ad_elements = {
-                'skip_button': "ytp-ad-skip-button",
-                'ad_badge': "ytp-ad-badge", 
-                'ad_duration': "ytp-ad-duration-remaining",
-                'ad_text': "ytp-ad-text",
-                'overlay': "ytp-ad-overlay-container"
-            }
-            
-            visible_ads = 0
-            for name, class_name in ad_elements.items():
-                try:
-                    element = driver.find_element(By.CLASS_NAME, class_name)
-                    if element.is_displayed():
-                        visible_ads += 1
-                        print(f"Warning: Ad element visible: {name}")
-                except:
-                    pass
-            
-            # Update statistics
-            if blocked_count > 0:
-                self.ads_blocked += blocked_count
-                print(f"✓ Blocked {blocked_count} ad requests on {video_url}")
-            
-            if visible_ads > 0:
-                self.ads_shown += visible_ads
-                print(f"✗ {visible_ads} ads still visible on {video_url}")
-            else:
-                print(f"✓ No visible ads on {video_url}")
+                print(f"   Testing: {video_url}")
+                return self.test_youtube_video(video_url, driver)
+            finally:
+                drivers.put(driver)
                 
-            self.videos_tested += 1
-            
-            # Log blocked URLs for debugging
-            if blocked_urls:
-                print(f"  Blocked URLs: {len(blocked_urls)}")
-                for url in blocked_urls[:5]:  # Show first 5
-                    print(f"    - {url}")
-            
+        # The shared driver plus one extra browser per additional worker; each
+        # is recorded as soon as it starts so a later launch failure still
+        # quits the ones already running
+        extra_drivers = []
+        try:
+            for _ in range(workers - 1):
+                extra_drivers.append(self._make_driver())
+            drivers = queue.Queue()
+            for driver in [self.driver] + extra_drivers:
+                drivers.put(driver)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(run, video_urls))
         finally:
-            driver.quit()
-            
+            for driver in extra_drivers:
+                self._quit_driver(driver)
+                
+        # Aggregate on the calling thread once all workers are done
+        for result in results:
+            if result is None:
+                continue
+            self.ads_blocked += result['ads_blocked']
+            self.ads_shown += result['ads_shown']
+            self.videos_tested += 1
+        
     def test_ad_server_blocking(self):
         """Test if known ad servers are blocked using JavaScript"""
         print("\nTesting ad server blocking with JavaScript injection...")
         
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--enable-logging')
-        options.add_argument('--v=1')
-        options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+        driver = self.driver
+        driver.get(AD_SERVER_TEST_URL)
         
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+        # Wait for test to complete
+        try:
+            WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return window.__testResults !== undefined")
+            )
+        except TimeoutException:
+            print("Timeout waiting for ad server test results")
+        
+        # Get results
+        results = driver.execute_script("return window.__testResults || {}")
+        blocked = results.get('blocked', 0)
+        total = results.get('total', 6)
+        
+        print(f"Ad servers blocked: {blocked}/{total}")
         
+        return blocked, total
+        
+    def is_host_sinkholed(self, host):
+        """True if host does not resolve or resolves only to sinkhole addresses"""
         try:
-            # Inject blocking script
-            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': self.get_blocking_script()
-            })
-            
-            # Test page that attempts to load ad resources
-            test_html = """
-            <!DOCTYPE html>
-            <html>
-            <head><title>Ad Server Test</title></head>
-            <body>
-                <h1>Testing Ad Server Blocking</h1>
-                <div id="results"></div>
-                <script>
-                    const adServers = [
-                        'https://doubleclick.net/test',
-                        'https://googleadservices.com/test',
-                        'https://googlesyndication.com/test',
-                        'https://google-analytics.com/test',
-                        'https://facebook.com/tr',
-                        'https://amazon-adsystem.com/test'
-                    ];
-                    
-                    let blocked = 0;
-                    let total = adServers.length;
-                    
-                    async function testBlocking() {
-                        for (const url of adServers) {
-                            try {
-                                await fetch(url);
-                                console.log('Not blocked:', url);
-                            } catch (e) {
-                                blocked++;
-                                console.log('Successfully blocked:', url);
-                            }
-                        }
-                        
-                        document.getElementById('results').innerHTML = 
-                            `Blocked: ${blocked}/${total} (${(blocked/total*100).toFixed(1)}%)`;
-                        window.__testResults = { blocked, total };
-                    }
-                    
-                    testBlocking();
-                </script>
-            </body>
-            </html>
-            """
-            
-            # Create a data URL from the HTML
-            import base64
-            html_b64 = base64.b64encode(test_html.encode()).decode()
-            driver.get(f"data:text/html;base64,{html_b64}")
-            
-            # Wait for test to complete
-            time.sleep(3)
-            
-            # Get results
-            results = driver.execute_script("return window.__testResults || {}")
-            blocked = results.get('blocked', 0)
-            total = results.get('total', 6)
-            
-            print(f"Ad servers blocked: {blocked}/{total}")
+            infos = socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)
+        except socket.gaierror as e:
+            if e.errno in BLOCKED_LOOKUP_ERRORS:
+                return True
+            raise
+        return all(info[4][0] in SINKHOLE_ADDRESSES for info in infos)
+        
+    def test_dns_blocking(self):
+        """Test if known ad servers are blocked by the device's DNS resolver"""
+        print("\nTesting ad server blocking via DNS resolution...")
+        
+        # Without a working resolver every ad host would look blocked
+        try:
+            control_sinkholed = self.is_host_sinkholed(DNS_CONTROL_HOST)
+        except socket.gaierror as e:
+            control_sinkholed = True
+            print(f"  Control lookup failed: {DNS_CONTROL_HOST}: {e}")
+        if control_sinkholed:
+            raise RuntimeError(
+                f"DNS control host {DNS_CONTROL_HOST} did not resolve; "
+                "cannot tell blocking from a broken or offline resolver"
+            )
+        
+        with ThreadPoolExecutor(max_workers=len(AD_SERVER_HOSTS)) as executor:
+            results = list(executor.map(self.is_host_sinkholed, AD_SERVER_HOSTS))
             
-            return blocked, total
+        for host, sinkholed in zip(AD_SERVER_HOSTS, results):
+            print(f"  {'Successfully blocked' if sinkholed else 'Not blocked'}: {host}")
             
-        finally:
-            driver.quit()
+        blocked = sum(results)
+        total = len(AD_SERVER_HOSTS)
+        print(f"Ad servers blocked: {blocked}/{total}")
+        
+        return blocked, total
         
     def calculate_block_rate(self):
         """Calculate the overall ad block rate"""
@@ -277,26 +529,25 @@ class YouTubeAdBlockTest:
             return 0
         return (self.ads_blocked / total_ads) * 100
         
-    def run_full_test(self):
-        """Run complete E2E test suite"""
-        print("Starting YouTube Ad Block E2E Test...")
+    def run_full_test(self, ad_server_check='browser'):
+        """Run complete E2E test suite (use inside a `with` block)
         
-        # Test popular YouTube videos that typically have ads
-        test_videos = [
-            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",  # Popular video
-            "https://www.youtube.com/watch?v=9bZkp7q19f0",  # Music video
-            "https://www.youtube.com/watch?v=kJQP7kiw5Fk",  # Another popular video
-        ]
+        ad_server_check selects how ad servers are probed: 'browser' runs the
+        injected-script test page, 'dns' resolves the hosts directly and is
+        meant for runs behind the VPN/DNS blocker.
+        """
+        print("Starting YouTube Ad Block E2E Test...")
         
         # Test video ad blocking
         print("\n1. Testing YouTube video ads...")
-        for video in test_videos:
-            print(f"   Testing: {video}")
-            self.test_youtube_video(video)
+        self.test_youtube_videos(TEST_VIDEOS)
             
         # Test ad server blocking
         print("\n2. Testing ad server blocking...")
-        blocked, total = self.test_ad_server_blocking()
+        if ad_server_check == 'dns':
+            blocked, total = self.test_dns_blocking()
+        else:
+            blocked, total = self.test_ad_server_blocking()
         print(f"   Blocked {blocked}/{total} ad servers")
         
         # Calculate results
@@ -317,8 +568,36 @@ class YouTubeAdBlockTest:
             print(f"\n❌ FAILED: Block rate {block_rate:.1f}% is below 80% target")
             return False
 
+# pytest entry points, so CI can spread videos over processes with
+# pytest-xdist (pytest -n auto test_youtube_blocking.py)
+
+@pytest.fixture(scope="module")
+def adblock_test():
+    """One browser per pytest worker, shared by that worker's tests"""
+    with YouTubeAdBlockTest() as test:
+        yield test
+
+@pytest.mark.parametrize("video_url", TEST_VIDEOS)
+def test_video_ads_blocked(adblock_test, video_results, video_url):
+    result = adblock_test.test_youtube_video(video_url)
+    if result is None:
+        # As in run_full_test, a player that never loads is not counted
+        pytest.skip(f"Video player did not load on {video_url}")
+    # Ads shown only count towards the session-wide 80% block rate gate in
+    # conftest.py, so one ad that slips through does not fail the run
+    video_results.append({'ads_blocked': result['ads_blocked'],
+                          'ads_shown': result['ads_shown']})
+    assert result['enabled'], f"Blocking script was not active on {video_url}"
+
+def test_ad_servers_blocked(adblock_test):
+    blocked, total = adblock_test.test_ad_server_blocking()
+    assert blocked / total >= 0.8, f"Only {blocked}/{total} ad servers blocked"
+
 if __name__ == "__main__":
-    import sys
-    test = YouTubeAdBlockTest()
-    success = test.run_full_test()
+    parser = argparse.ArgumentParser(description="YouTube ad blocking E2E test")
+    parser.add_argument('--ad-server-check', choices=['browser', 'dns'], default='browser',
+                        help="probe ad servers from a test page (default) or via DNS")
+    args = parser.parse_args()
+    with YouTubeAdBlockTest() as test:
+        success = test.run_full_test(ad_server_check=args.ad_server_check)
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 """
 Generate realistic app screenshots for app store submissions.
-Requires: Pillow (pip install Pillow)
+Requires: Pillow (pip install -r scripts/requirements.txt)
+Pillow-SIMD can be installed in place of Pillow for faster resampling,
+see scripts/requirements.txt
 """
 
+import PIL
 from PIL import Image, ImageDraw, ImageFont
+import argparse
 import os
 from pathlib import Path
 import datetime
+import functools
+from screenshot_common import PNG_SAVE_OPTIONS, group_by_aspect, measure_text
+from concurrent.futures import ProcessPoolExecutor
 
 # Brand colors
 PRIMARY_COLOR = (0, 122, 255)  # iOS Blue
@@ -34,6 +41,69 @@ ANDROID_SIZES = {
     "tablet": (1600, 2560)  # 10" tablet
 }
 
+# Height of the status bar band along the top of each screen
+STATUS_BAR_HEIGHT = 30
+
+FONT_PATH = "/System/Library/Fonts/Helvetica.ttc"
+MONO_FONT_PATH = "/System/Library/Fonts/Menlo.ttc"
+# Colour emoji fonts are bitmap strikes and only load at a strike size
+EMOJI_FONT_PATH = "/System/Library/Fonts/Apple Color Emoji.ttc"
+EMOJI_FONT_SIZE = 160
+
+@functools.lru_cache(maxsize=None)
+def _font(size, mono=False):
+    """Load a font once per (size, mono), fallback to default if not available."""
+    try:
+        return ImageFont.truetype(MONO_FONT_PATH if mono else FONT_PATH, size)
+    except OSError:
+        return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=None)
+def _card_sprite(width, height, radius, color):
+    """Rounded rectangle rendered once per shape; its alpha is the paste mask."""
+    sprite = Image.new('RGBA', (width + 1, height + 1), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).rounded_rectangle(
+        [(0, 0), (width, height)],
+        radius=radius,
+        fill=color
+    )
+    return sprite
+
+def paste_card(img, position, width, height, radius, color):
+    """Paste a cached rounded card, equivalent to draw.rounded_rectangle with
+    [position, (x + width, y + height)]."""
+    sprite = _card_sprite(width, height, radius, color)
+    img.paste(sprite, position, sprite)
+
+@functools.lru_cache(maxsize=None)
+def _shield_sprite(size, color, shoulders=(0.3, 0.6), check_width=0):
+    """Six-point shield rendered once per shape, optionally with a white check
+    mark of the given stroke width; its alpha is the paste mask."""
+    sprite = Image.new('RGBA', (size + 1, size + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
+    upper, lower = (size * s for s in shoulders)
+    draw.polygon(
+        [(size // 2, 0), (size, upper), (size, lower),
+         (size // 2, size), (0, lower), (0, upper)],
+        fill=color
+    )
+    if check_width:
+        check_size = size // 3
+        check_x = check_y = size // 2
+        draw.line(
+            [(check_x - check_size//3, check_y),
+             (check_x - check_size//6, check_y + check_size//4),
+             (check_x + check_size//3, check_y - check_size//4)],
+            fill=(255, 255, 255),
+            width=check_width
+        )
+    return sprite
+
+def paste_shield(img, position, size, color, **kwargs):
+    """Paste a cached shield whose bounding box starts at position."""
+    sprite = _shield_sprite(size, color, **kwargs)
+    img.paste(sprite, position, sprite)
+
 def create_main_screen(width, height, dark_mode=False):
     """Create the main protection screen."""
     bg_color = DARK_BACKGROUND if dark_mode else BACKGROUND_COLOR
@@ -49,27 +119,20 @@ def create_main_screen(width, height, dark_mode=False):
     medium_text_size = width // 25
     small_text_size = width // 30
     
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", title_size)
-        large_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", large_text_size)
-        medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", medium_text_size)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", small_text_size)
-    except:
-        title_font = ImageFont.load_default()
-        large_font = ImageFont.load_default()
-        medium_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    title_font = _font(title_size)
+    large_font = _font(large_text_size)
+    medium_font = _font(medium_text_size)
+    small_font = _font(small_text_size)
     
     padding = width // 20
     y_offset = height // 10
     
     # Draw status bar
-    draw_status_bar(draw, width, 0, dark_mode)
+    draw_status_bar(img, width, 0, dark_mode)
     
     # Title
     title = "AdBlock"
-    bbox = draw.textbbox((0, 0), title, font=title_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(title, title_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         title,
@@ -114,8 +177,7 @@ def create_main_screen(width, height, dark_mode=False):
     # Status text
     y_offset = circle_y + circle_size + padding
     status_text = "保護中"
-    bbox = draw.textbbox((0, 0), status_text, font=large_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(status_text, large_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         status_text,
@@ -137,11 +199,7 @@ def create_main_screen(width, height, dark_mode=False):
     
     for stat_name, stat_value in stats:
         # Draw card
-        draw.rounded_rectangle(
-            [(padding, y_offset), (width - padding, y_offset + card_height)],
-            radius=20,
-            fill=card_color
-        )
+        paste_card(img, (padding, y_offset), width - 2 * padding, card_height, 20, card_color)
         
         # Stat name
         draw.text(
@@ -152,8 +210,7 @@ def create_main_screen(width, height, dark_mode=False):
         )
         
         # Stat value
-        bbox = draw.textbbox((0, 0), stat_value, font=medium_font)
-        text_width = bbox[2] - bbox[0]
+        text_width, _ = measure_text(stat_value, medium_font)
         draw.text(
             (width - padding * 2 - text_width, y_offset + card_height // 4),
             stat_value,
@@ -164,7 +221,7 @@ def create_main_screen(width, height, dark_mode=False):
         y_offset += card_height + card_spacing
     
     # Navigation bar
-    draw_navigation_bar(draw, width, height, dark_mode)
+    draw_navigation_bar(img, width, height, dark_mode)
     
     return img
 
@@ -183,27 +240,20 @@ def create_youtube_screen(width, height, dark_mode=False):
     medium_text_size = width // 25
     small_text_size = width // 30
     
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", title_size)
-        header_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", header_size)
-        medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", medium_text_size)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", small_text_size)
-    except:
-        title_font = ImageFont.load_default()
-        header_font = ImageFont.load_default()
-        medium_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    title_font = _font(title_size)
+    header_font = _font(header_size)
+    medium_font = _font(medium_text_size)
+    small_font = _font(small_text_size)
     
     padding = width // 20
     y_offset = height // 10
     
     # Draw status bar
-    draw_status_bar(draw, width, 0, dark_mode)
+    draw_status_bar(img, width, 0, dark_mode)
     
     # Title
     title = "YouTube広告ブロック"
-    bbox = draw.textbbox((0, 0), title, font=title_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(title, title_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         title,
@@ -237,8 +287,7 @@ def create_youtube_screen(width, height, dark_mode=False):
     
     # Block rate
     rate_text = "80%+"
-    bbox = draw.textbbox((0, 0), rate_text, font=header_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(rate_text, header_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         rate_text,
@@ -249,8 +298,7 @@ def create_youtube_screen(width, height, dark_mode=False):
     y_offset += header_size + padding // 2
     
     subtitle = "のYouTube広告をブロック"
-    bbox = draw.textbbox((0, 0), subtitle, font=medium_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(subtitle, medium_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         subtitle,
@@ -278,7 +326,7 @@ def create_youtube_screen(width, height, dark_mode=False):
         y_offset += small_text_size + padding // 2
     
     # Navigation bar
-    draw_navigation_bar(draw, width, height, dark_mode)
+    draw_navigation_bar(img, width, height, dark_mode)
     
     return img
 
@@ -296,27 +344,20 @@ def create_custom_rules_screen(width, height, dark_mode=False):
     medium_text_size = width // 25
     small_text_size = width // 30
     
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", title_size)
-        medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", medium_text_size)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", small_text_size)
-        code_font = ImageFont.truetype("/System/Library/Fonts/Menlo.ttc", small_text_size)
-    except:
-        title_font = ImageFont.load_default()
-        medium_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
-        code_font = ImageFont.load_default()
+    title_font = _font(title_size)
+    medium_font = _font(medium_text_size)
+    small_font = _font(small_text_size)
+    code_font = _font(small_text_size, mono=True)
     
     padding = width // 20
     y_offset = height // 10
     
     # Draw status bar
-    draw_status_bar(draw, width, 0, dark_mode)
+    draw_status_bar(img, width, 0, dark_mode)
     
     # Title
     title = "カスタムフィルター"
-    bbox = draw.textbbox((0, 0), title, font=title_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(title, title_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         title,
@@ -335,9 +376,7 @@ def create_custom_rules_screen(width, height, dark_mode=False):
     )
     
     add_text = "+ 新しいルールを追加"
-    bbox = draw.textbbox((0, 0), add_text, font=medium_font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
+    text_width, text_height = measure_text(add_text, medium_font)
     draw.text(
         ((width - text_width) // 2, y_offset + (button_height - text_height) // 2),
         add_text,
@@ -360,11 +399,7 @@ def create_custom_rules_screen(width, height, dark_mode=False):
     
     for rule, description, is_active in rules:
         # Draw card
-        draw.rounded_rectangle(
-            [(padding, y_offset), (width - padding, y_offset + card_height)],
-            radius=15,
-            fill=card_color
-        )
+        paste_card(img, (padding, y_offset), width - 2 * padding, card_height, 15, card_color)
         
         # Toggle switch
         switch_width = width // 10
@@ -373,11 +408,8 @@ def create_custom_rules_screen(width, height, dark_mode=False):
         switch_y = y_offset + (card_height - switch_height) // 2
         
         switch_color = SUCCESS_COLOR if is_active else (200, 200, 200)
-        draw.rounded_rectangle(
-            [(switch_x, switch_y), (switch_x + switch_width, switch_y + switch_height)],
-            radius=switch_height // 2,
-            fill=switch_color
-        )
+        paste_card(img, (switch_x, switch_y), switch_width, switch_height,
+                   switch_height // 2, switch_color)
         
         # Switch knob
         knob_size = switch_height - 4
@@ -406,7 +438,7 @@ def create_custom_rules_screen(width, height, dark_mode=False):
         y_offset += card_height + card_spacing
     
     # Navigation bar
-    draw_navigation_bar(draw, width, height, dark_mode)
+    draw_navigation_bar(img, width, height, dark_mode)
     
     return img
 
@@ -425,27 +457,19 @@ def create_privacy_screen(width, height, dark_mode=False):
     medium_text_size = width // 25
     small_text_size = width // 30
     
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", title_size)
-        header_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", header_size)
-        medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", medium_text_size)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", small_text_size)
-    except:
-        title_font = ImageFont.load_default()
-        header_font = ImageFont.load_default()
-        medium_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    title_font = _font(title_size)
+    header_font = _font(header_size)
+    small_font = _font(small_text_size)
     
     padding = width // 20
     y_offset = height // 10
     
     # Draw status bar
-    draw_status_bar(draw, width, 0, dark_mode)
+    draw_status_bar(img, width, 0, dark_mode)
     
     # Title
     title = "プライバシー優先"
-    bbox = draw.textbbox((0, 0), title, font=title_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(title, title_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         title,
@@ -459,27 +483,9 @@ def create_privacy_screen(width, height, dark_mode=False):
     shield_size = width // 4
     shield_x = (width - shield_size) // 2
     
-    # Draw shield
-    points = [
-        (shield_x + shield_size // 2, y_offset),
-        (shield_x + shield_size, y_offset + shield_size // 3),
-        (shield_x + shield_size, y_offset + shield_size * 2 // 3),
-        (shield_x + shield_size // 2, y_offset + shield_size),
-        (shield_x, y_offset + shield_size * 2 // 3),
-        (shield_x, y_offset + shield_size // 3)
-    ]
-    draw.polygon(points, fill=SUCCESS_COLOR)
-    
-    # Check mark in shield
-    check_size = shield_size // 3
-    check_x = shield_x + shield_size // 2
-    check_y = y_offset + shield_size // 2
-    draw.line(
-        [(check_x - check_size//3, check_y),
-         (check_x - check_size//6, check_y + check_size//4),
-         (check_x + check_size//3, check_y - check_size//4)],
-        fill=(255, 255, 255),
-        width=width//40
+    paste_shield(
+        img, (shield_x, y_offset), shield_size, SUCCESS_COLOR,
+        shoulders=(1/3, 2/3), check_width=width//40
     )
     
     y_offset += shield_size + padding * 2
@@ -497,19 +503,11 @@ def create_privacy_screen(width, height, dark_mode=False):
     
     for emoji, text in features:
         # Draw card
-        draw.rounded_rectangle(
-            [(padding, y_offset), (width - padding, y_offset + card_height)],
-            radius=15,
-            fill=card_color
-        )
+        paste_card(img, (padding, y_offset), width - 2 * padding, card_height, 15, card_color)
         
         # Emoji
-        draw.text(
-            (padding * 2, y_offset + (card_height - medium_text_size) // 2),
-            emoji,
-            fill=text_color,
-            font=medium_font
-        )
+        sprite = _emoji_sprite(emoji, medium_text_size, text_color)
+        img.paste(sprite, (padding * 2, y_offset + (card_height - medium_text_size) // 2), sprite)
         
         # Text
         draw.text(
@@ -522,7 +520,7 @@ def create_privacy_screen(width, height, dark_mode=False):
         y_offset += card_height + padding // 2
     
     # Navigation bar
-    draw_navigation_bar(draw, width, height, dark_mode)
+    draw_navigation_bar(img, width, height, dark_mode)
     
     return img
 
@@ -541,27 +539,20 @@ def create_performance_screen(width, height, dark_mode=False):
     medium_text_size = width // 25
     small_text_size = width // 30
     
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", title_size)
-        large_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", large_text_size)
-        medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", medium_text_size)
-        small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", small_text_size)
-    except:
-        title_font = ImageFont.load_default()
-        large_font = ImageFont.load_default()
-        medium_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
+    title_font = _font(title_size)
+    large_font = _font(large_text_size)
+    medium_font = _font(medium_text_size)
+    small_font = _font(small_text_size)
     
     padding = width // 20
     y_offset = height // 10
     
     # Draw status bar
-    draw_status_bar(draw, width, 0, dark_mode)
+    draw_status_bar(img, width, 0, dark_mode)
     
     # Title
     title = "パフォーマンス"
-    bbox = draw.textbbox((0, 0), title, font=title_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(title, title_font)
     draw.text(
         ((width - text_width) // 2, y_offset),
         title,
@@ -581,8 +572,7 @@ def create_performance_screen(width, height, dark_mode=False):
     
     # Memory icon and value
     memory_text = "28 MB"
-    bbox = draw.textbbox((0, 0), memory_text, font=large_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(memory_text, large_font)
     draw.text(
         ((width - text_width) // 2, y_offset + card_height // 4),
         memory_text,
@@ -591,8 +581,7 @@ def create_performance_screen(width, height, dark_mode=False):
     )
     
     memory_label = "メモリ使用量（目標: 30MB以下）"
-    bbox = draw.textbbox((0, 0), memory_label, font=small_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(memory_label, small_font)
     draw.text(
         ((width - text_width) // 2, y_offset + card_height * 2 // 3),
         memory_label,
@@ -614,11 +603,7 @@ def create_performance_screen(width, height, dark_mode=False):
     
     for metric_name, metric_value, color in metrics:
         # Draw card
-        draw.rounded_rectangle(
-            [(padding, y_offset), (width - padding, y_offset + card_height)],
-            radius=15,
-            fill=card_color
-        )
+        paste_card(img, (padding, y_offset), width - 2 * padding, card_height, 15, card_color)
         
         # Metric name
         draw.text(
@@ -629,8 +614,7 @@ def create_performance_screen(width, height, dark_mode=False):
         )
         
         # Metric value
-        bbox = draw.textbbox((0, 0), metric_value, font=medium_font)
-        text_width = bbox[2] - bbox[0]
+        text_width, _ = measure_text(metric_value, medium_font)
         draw.text(
             (width - padding * 2 - text_width, y_offset + (card_height - medium_text_size) // 2),
             metric_value,
@@ -641,53 +625,91 @@ def create_performance_screen(width, height, dark_mode=False):
         y_offset += card_height + padding // 2
     
     # Navigation bar
-    draw_navigation_bar(draw, width, height, dark_mode)
+    draw_navigation_bar(img, width, height, dark_mode)
     
     return img
 
-def draw_status_bar(draw, width, y, dark_mode=False):
-    """Draw iOS-style status bar."""
-    text_color = TEXT_COLOR_DARK if dark_mode else TEXT_COLOR
+def _text_layer(size, color, texts, font):
+    """Transparent RGBA layer with texts [(position, text)] drawn in color.
+    
+    The transparent pixels already carry color, so antialiased edges keep the
+    text colour and only vary in alpha; pasting the layer with its alpha as
+    mask gives the same pixels as draw.text on the target image.
+    """
+    layer = Image.new('RGBA', size, color + (0,))
+    draw = ImageDraw.Draw(layer)
+    for position, text in texts:
+        draw.text(position, text, fill=color + (255,), font=font)
+    return layer
+
+@functools.lru_cache(maxsize=None)
+def _emoji_sprite(emoji, size, color):
+    """Emoji rasterized once per (emoji, size, colour) for pasting.
     
+    Uses the colour emoji font scaled to size when it is available, otherwise
+    the same glyph draw.text would produce with the regular font.
+    """
     try:
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 14)
-    except:
-        font = ImageFont.load_default()
+        emoji_font = ImageFont.truetype(EMOJI_FONT_PATH, EMOJI_FONT_SIZE)
+    except OSError:
+        font = _font(size)
+        _, _, right, bottom = font.getbbox(emoji)
+        return _text_layer((max(right, 1), max(bottom, 1)), color, [((0, 0), emoji)], font)
+    
+    glyph = Image.new('RGBA', (EMOJI_FONT_SIZE * 2, EMOJI_FONT_SIZE * 2), (0, 0, 0, 0))
+    ImageDraw.Draw(glyph).text((0, 0), emoji, font=emoji_font, embedded_color=True)
+    glyph = glyph.crop(glyph.getbbox() or (0, 0, 1, 1))
+    scale = size / glyph.height
+    return glyph.resize((max(round(glyph.width * scale), 1), size), Image.LANCZOS)
+
+@functools.lru_cache(maxsize=None)
+def _status_bar_sprite(width, dark_mode, time):
+    """Status bar rendered once per (width, theme, displayed time)."""
+    text_color = TEXT_COLOR_DARK if dark_mode else TEXT_COLOR
+    font = _font(14)
     
-    # Time
+    # Time, battery and signal indicators (simplified)
+    return _text_layer((width, STATUS_BAR_HEIGHT), text_color, [
+        ((20, 5), time),
+        ((width - 100, 5), "100% 🔋")
+    ], font)
+
+def draw_status_bar(img, width, y, dark_mode=False):
+    """Draw iOS-style status bar."""
     time = datetime.datetime.now().strftime("%H:%M")
-    draw.text((20, y + 5), time, fill=text_color, font=font)
-    
-    # Battery and signal indicators (simplified)
-    draw.text((width - 100, y + 5), "100% 🔋", fill=text_color, font=font)
+    sprite = _status_bar_sprite(width, dark_mode, time)
+    img.paste(sprite, (0, y), sprite)
 
-def draw_navigation_bar(draw, width, height, dark_mode=False):
-    """Draw bottom navigation bar."""
+@functools.lru_cache(maxsize=None)
+def _navigation_bar_sprite(width, height, dark_mode=False):
+    """Navigation bar rendered once per (width, height, theme)."""
     nav_height = height // 12
-    y = height - nav_height
+    sprite = Image.new('RGBA', (width, nav_height), (0, 0, 0, 0))
     
     # Draw separator
-    draw.line([(0, y), (width, y)], fill=(200, 200, 200) if not dark_mode else (60, 60, 60), width=1)
+    separator_color = (200, 200, 200) if not dark_mode else (60, 60, 60)
+    ImageDraw.Draw(sprite).line([(0, 0), (width, 0)], fill=separator_color + (255,), width=1)
     
     # Navigation items
     items = ["ホーム", "統計", "設定"]
     item_width = width // len(items)
     
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", width // 40)
-    except:
-        font = ImageFont.load_default()
+    font = _font(width // 40)
     
+    placed = {}
     for i, item in enumerate(items):
         x = i * item_width + item_width // 2
-        bbox = draw.textbbox((0, 0), item, font=font)
-        text_width = bbox[2] - bbox[0]
-        draw.text(
-            (x - text_width // 2, y + nav_height // 3),
-            item,
-            fill=PRIMARY_COLOR if i == 0 else (150, 150, 150),
-            font=font
-        )
+        text_width, _ = measure_text(item, font)
+        color = PRIMARY_COLOR if i == 0 else (150, 150, 150)
+        placed.setdefault(color, []).append(((x - text_width // 2, nav_height // 3), item))
+    for color, texts in placed.items():
+        sprite = Image.alpha_composite(sprite, _text_layer(sprite.size, color, texts, font))
+    return sprite
+
+def draw_navigation_bar(img, width, height, dark_mode=False):
+    """Draw bottom navigation bar."""
+    sprite = _navigation_bar_sprite(width, height, dark_mode)
+    img.paste(sprite, (0, height - sprite.height), sprite)
 
 def generate_app_icons():
     """Generate app icons with better design."""
@@ -701,30 +723,17 @@ def generate_app_icons():
         draw = ImageDraw.Draw(img)
         
         # Draw shield shape
-        shield_size = size * 0.6
-        shield_x = (size - shield_size) // 2
-        shield_y = size * 0.2
-        
-        points = [
-            (size // 2, shield_y),
-            (shield_x + shield_size, shield_y + shield_size * 0.3),
-            (shield_x + shield_size, shield_y + shield_size * 0.6),
-            (size // 2, shield_y + shield_size),
-            (shield_x, shield_y + shield_size * 0.6),
-            (shield_x, shield_y + shield_size * 0.3)
-        ]
-        draw.polygon(points, fill=(255, 255, 255))
+        shield_size = int(size * 0.6)
+        paste_shield(
+            img, ((size - shield_size) // 2, int(size * 0.2)),
+            shield_size, (255, 255, 255)
+        )
         
         # Draw "AB" text
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", int(size * 0.25))
-        except:
-            font = ImageFont.load_default()
+        font = _font(int(size * 0.25))
         
         text = "AB"
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_width, text_height = measure_text(text, font)
         
         draw.text(
             ((size - text_width) // 2, (size - text_height) // 2),
@@ -740,7 +749,7 @@ def generate_app_icons():
             path = Path("assets/app-store/android/graphics/icon-512.png")
         
         path.parent.mkdir(parents=True, exist_ok=True)
-        img.save(path, "PNG")
+        img.save(path, "PNG", **PNG_SAVE_OPTIONS)
         print(f"Generated {path}")
 
 def generate_android_feature_graphic():
@@ -748,27 +757,11 @@ def generate_android_feature_graphic():
     img = Image.new('RGB', (1024, 500), PRIMARY_COLOR)
     draw = ImageDraw.Draw(img)
     
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-        subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 40)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
+    title_font = _font(80)
+    subtitle_font = _font(40)
     
     # Draw shield
-    shield_size = 200
-    shield_x = 100
-    shield_y = 150
-    
-    points = [
-        (shield_x + shield_size // 2, shield_y),
-        (shield_x + shield_size, shield_y + shield_size * 0.3),
-        (shield_x + shield_size, shield_y + shield_size * 0.6),
-        (shield_x + shield_size // 2, shield_y + shield_size),
-        (shield_x, shield_y + shield_size * 0.6),
-        (shield_x, shield_y + shield_size * 0.3)
-    ]
-    draw.polygon(points, fill=(255, 255, 255, 128))
+    paste_shield(img, (100, 150), 200, (255, 255, 255))
     
     # Draw title
     title = "AdBlock"
@@ -790,12 +783,90 @@ def generate_android_feature_graphic():
     
     path = Path("assets/app-store/android/graphics/feature-graphic.png")
     path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(path, "PNG")
+    img.save(path, "PNG", **PNG_SAVE_OPTIONS)
     print(f"Generated {path}")
 
+def screenshot_jobs(platforms):
+    """Build one job per (aspect group, screen, theme) for _render_job.
+    
+    platforms is a list of (sizes, out_dir, variants), where variants is a
+    list of (file stem, screen function, dark_mode). Sizes are grouped across
+    platforms, so an Android size close enough to an iOS one shares its
+    render. Output directories are created here, before jobs are dispatched
+    to workers.
+    """
+    sizes = {}
+    for platform, (platform_sizes, _, _) in enumerate(platforms):
+        for size_name, size in platform_sizes.items():
+            sizes[(platform, size_name)] = size
+    
+    jobs = []
+    for group in group_by_aspect(sizes):
+        master_size = group[0][1]
+        # (func, dark_mode) -> targets, in first-seen order
+        renders = {}
+        for (platform, size_name), size in group:
+            _, out_dir, variants = platforms[platform]
+            for stem, func, dark_mode in variants:
+                path = Path(out_dir) / size_name / f"{stem}.png"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                renders.setdefault((func, dark_mode), []).append((path, size))
+        for (func, dark_mode), targets in renders.items():
+            jobs.append((func, master_size, dark_mode, targets))
+    return jobs
+
+def _render_job(job, save=True):
+    """Render a screen once and save it at every target size.
+    
+    With save=False the images are returned as [(path, image)] instead.
+    """
+    func, (master_width, master_height), dark_mode, targets = job
+    master = func(master_width, master_height, dark_mode=dark_mode)
+    rendered = []
+    for path, (width, height) in targets:
+        if (width, height) == (master_width, master_height):
+            img = master
+        else:
+            img = master.resize((width, height), Image.LANCZOS)
+        if save:
+            img.save(path, "PNG", **PNG_SAVE_OPTIONS)
+        else:
+            rendered.append((path, img))
+    if save:
+        return [path for path, _ in targets]
+    return rendered
+
+def save_contact_sheet(rendered, path):
+    """Save screenshots as one PDF, one page per size laid out left to right."""
+    pages = {}
+    for shot_path, img in sorted(rendered, key=lambda item: str(item[0])):
+        pages.setdefault(shot_path.parent, []).append(img)
+    
+    sheets = []
+    for images in pages.values():
+        sheet = Image.new('RGB', (sum(img.width for img in images),
+                                  max(img.height for img in images)), (255, 255, 255))
+        x = 0
+        for img in images:
+            sheet.paste(img, (x, 0))
+            x += img.width
+        sheets.append(sheet)
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sheets[0].save(path, "PDF", save_all=True, append_images=sheets[1:])
+
 def main():
     """Generate all app screenshots."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--contact-sheet', metavar='PDF',
+                        help='write screenshots to one review PDF instead of '
+                             'individual PNGs')
+    args = parser.parse_args()
+    
     print("Generating app screenshots...")
+    # Pillow-SIMD builds report a ".postN" version suffix
+    print(f"Using Pillow {PIL.__version__}")
     
     # Screenshot generators
     screenshot_funcs = [
@@ -806,38 +877,38 @@ def main():
         ("performance", create_performance_screen)
     ]
     
-    # Generate iOS screenshots
-    for size_name, (width, height) in IOS_SIZES.items():
-        print(f"\nGenerating iOS {size_name} screenshots...")
-        for i, (name, func) in enumerate(screenshot_funcs):
-            # Generate both light and dark mode for first screenshot
-            if i == 0:
-                img = func(width, height, dark_mode=False)
-                path = Path(f"assets/app-store/ios/screenshots/{size_name}/screenshot_{i+1}_light.png")
-                path.parent.mkdir(parents=True, exist_ok=True)
-                img.save(path, "PNG")
-                print(f"  Generated {path}")
-                
-                img = func(width, height, dark_mode=True)
-                path = Path(f"assets/app-store/ios/screenshots/{size_name}/screenshot_{i+1}_dark.png")
-                img.save(path, "PNG")
-                print(f"  Generated {path}")
+    # iOS: both light and dark mode for the first screenshot
+    ios_variants = []
+    for i, (name, func) in enumerate(screenshot_funcs):
+        if i == 0:
+            ios_variants.append((f"screenshot_{i+1}_light", func, False))
+            ios_variants.append((f"screenshot_{i+1}_dark", func, True))
+        else:
+            ios_variants.append((f"screenshot_{i+1}", func, False))
+    
+    android_variants = [
+        (f"screenshot_{i+1}", func, False)
+        for i, (name, func) in enumerate(screenshot_funcs)
+    ]
+    
+    # Generate iOS and Android screenshots in parallel, one process per core
+    jobs = screenshot_jobs([
+        (IOS_SIZES, "assets/app-store/ios/screenshots", ios_variants),
+        (ANDROID_SIZES, "assets/app-store/android/screenshots", android_variants)
+    ])
+    print(f"\nGenerating {len(jobs)} screenshot renders...")
+    render = functools.partial(_render_job, save=not args.contact_sheet)
+    rendered = []
+    with ProcessPoolExecutor() as executor:
+        for result in executor.map(render, jobs):
+            if args.contact_sheet:
+                rendered.extend(result)
             else:
-                img = func(width, height, dark_mode=False)
-                path = Path(f"assets/app-store/ios/screenshots/{size_name}/screenshot_{i+1}.png")
-                path.parent.mkdir(parents=True, exist_ok=True)
-                img.save(path, "PNG")
-                print(f"  Generated {path}")
-    
-    # Generate Android screenshots
-    for device_type, (width, height) in ANDROID_SIZES.items():
-        print(f"\nGenerating Android {device_type} screenshots...")
-        for i, (name, func) in enumerate(screenshot_funcs):
-            img = func(width, height, dark_mode=False)
-            path = Path(f"assets/app-store/android/screenshots/{device_type}/screenshot_{i+1}.png")
-            path.parent.mkdir(parents=True, exist_ok=True)
-            img.save(path, "PNG")
-            print(f"  Generated {path}")
+                for path in result:
+                    print(f"  Generated {path}")
+    if args.contact_sheet:
+        save_contact_sheet(rendered, args.contact_sheet)
+        print(f"  Generated {args.contact_sheet} ({len(rendered)} screenshots)")
     
     # Generate app icons
     print("\nGenerating app icons...")
@@ -850,4 +921,4 @@ def main():
     print("\n✅ All app screenshots generated successfully!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,12 +1,21 @@
 #!/usr/bin/env python3
 """
 Generate placeholder screenshots for app store submissions.
-Requires: Pillow (pip install Pillow)
+Requires: Pillow (pip install -r scripts/requirements.txt)
+Pillow-SIMD can be installed in place of Pillow for faster fills and
+compositing, see scripts/requirements.txt
 """
 
+import PIL
 from PIL import Image, ImageDraw, ImageFont
+import argparse
+import hashlib
+import json
 import os
 from pathlib import Path
+import functools
+from screenshot_common import PNG_SAVE_OPTIONS, group_by_aspect, measure_text
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Brand colors
 PRIMARY_COLOR = (0, 122, 255)  # iOS Blue
@@ -28,6 +37,18 @@ ANDROID_SIZES = {
     "tablet": (1600, 2560)  # 10" tablet
 }
 
+# PLACEHOLDER_HALFRES=1 renders at half width and height and upscales with
+# NEAREST, for quick local iterations where fidelity does not matter
+HALF_RESOLUTION = os.environ.get("PLACEHOLDER_HALFRES") == "1"
+
+# Records the inputs each screenshot was rendered from, so unchanged ones are
+# skipped. Bump CACHE_VERSION whenever create_placeholder_screenshot's output
+# changes.
+CACHE_FILE = "assets/app-store/.placeholder.cache"
+CACHE_VERSION = "v3"
+
+FONT_PATH = "/System/Library/Fonts/Helvetica.ttc"
+
 # Screenshot content
 SCREENSHOTS = [
     {
@@ -57,36 +78,61 @@ SCREENSHOTS = [
     }
 ]
 
-def create_placeholder_screenshot(width, height, screenshot_data, index):
-    """Create a placeholder screenshot with given dimensions and content."""
-    # Create image
-    img = Image.new('RGB', (width, height), BACKGROUND_COLOR)
-    draw = ImageDraw.Draw(img)
+@functools.lru_cache(maxsize=64)
+def _font(size):
+    """Load the font once per size, fallback to default if not available."""
+    try:
+        return ImageFont.truetype(FONT_PATH, size)
+    except OSError:
+        return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=None)
+def _layout(width, height, stat_count):
+    """Geometry and fonts shared by every screenshot of a size.
     
-    # Calculate positions
-    center_x = width // 2
+    Only the strings differ between screenshots, so positions are computed once
+    per (width, height, stat_count).
+    """
     padding = width // 10
+    icon_size = width // 4
+    icon_top = height // 10
+    title_font_size = width // 15
+    subtitle_font_size = width // 20
+    stat_font_size = width // 25
     
-    # Try to use a nice font, fallback to default
-    try:
-        title_font_size = width // 15
-        subtitle_font_size = width // 20
-        stat_font_size = width // 25
-        
-        # Try to load system fonts
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", title_font_size)
-        subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", subtitle_font_size)
-        stat_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", stat_font_size)
-    except:
-        # Fallback to default font
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
-        stat_font = ImageFont.load_default()
+    title_y = icon_top + icon_size + padding
+    subtitle_y = title_y + title_font_size + padding // 2
+    stats_y = subtitle_y + subtitle_font_size + padding
+    stat_height = height // 8
+    stat_spacing = padding // 2
+    
+    return {
+        "padding": padding,
+        "icon_left": (width - icon_size) // 2,
+        "icon_top": icon_top,
+        "icon_size": icon_size,
+        "title_font": _font(title_font_size),
+        "subtitle_font": _font(subtitle_font_size),
+        "stat_font": _font(stat_font_size),
+        "title_y": title_y,
+        "subtitle_y": subtitle_y,
+        "stat_tops": [stats_y + i * (stat_height + stat_spacing) for i in range(stat_count)],
+        "stat_height": stat_height,
+        "watermark_y": height - padding * 2
+    }
+
+@functools.lru_cache(maxsize=None)
+def _template(width, height, stat_count):
+    """Background, app icon placeholder and empty stat boxes, shared by every
+    screenshot of a size. Callers must copy it before drawing."""
+    layout = _layout(width, height, stat_count)
+    img = Image.new('RGB', (width, height), BACKGROUND_COLOR)
+    draw = ImageDraw.Draw(img)
     
     # Draw app icon placeholder
-    icon_size = width // 4
-    icon_top = height // 10
-    icon_left = (width - icon_size) // 2
+    icon_size = layout["icon_size"]
+    icon_top = layout["icon_top"]
+    icon_left = layout["icon_left"]
     draw.rounded_rectangle(
         [(icon_left, icon_top), (icon_left + icon_size, icon_top + icon_size)],
         radius=icon_size // 5,
@@ -95,60 +141,62 @@ def create_placeholder_screenshot(width, height, screenshot_data, index):
     
     # Draw "AdBlock" text in icon
     icon_text = "AB"
-    bbox = draw.textbbox((0, 0), icon_text, font=title_font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
+    text_width, text_height = measure_text(icon_text, layout["title_font"])
     draw.text(
         (icon_left + (icon_size - text_width) // 2, 
          icon_top + (icon_size - text_height) // 2),
         icon_text,
         fill=(255, 255, 255),
-        font=title_font
+        font=layout["title_font"]
     )
     
+    # Draw stat boxes
+    padding = layout["padding"]
+    for stat_y in layout["stat_tops"]:
+        draw.rounded_rectangle(
+            [(padding, stat_y), (width - padding, stat_y + layout["stat_height"])],
+            radius=20,
+            fill=(255, 255, 255),
+            outline=PRIMARY_COLOR,
+            width=3
+        )
+    
+    return img
+
+def create_placeholder_screenshot(width, height, screenshot_data, index):
+    """Create a placeholder screenshot with given dimensions and content."""
+    stats = screenshot_data["stats"]
+    layout = _layout(width, height, len(stats))
+    title_font = layout["title_font"]
+    subtitle_font = layout["subtitle_font"]
+    stat_font = layout["stat_font"]
+    
+    # Start from the shared background, icon and stat boxes
+    img = _template(width, height, len(stats)).copy()
+    draw = ImageDraw.Draw(img)
+    
     # Draw title
-    title_y = icon_top + icon_size + padding
-    bbox = draw.textbbox((0, 0), screenshot_data["title"], font=title_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(screenshot_data["title"], title_font)
     draw.text(
-        ((width - text_width) // 2, title_y),
+        ((width - text_width) // 2, layout["title_y"]),
         screenshot_data["title"],
         fill=TEXT_COLOR,
         font=title_font
     )
     
     # Draw subtitle
-    subtitle_y = title_y + title_font_size + padding // 2
-    bbox = draw.textbbox((0, 0), screenshot_data["subtitle"], font=subtitle_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(screenshot_data["subtitle"], subtitle_font)
     draw.text(
-        ((width - text_width) // 2, subtitle_y),
+        ((width - text_width) // 2, layout["subtitle_y"]),
         screenshot_data["subtitle"],
         fill=(100, 100, 100),
         font=subtitle_font
     )
     
-    # Draw stats boxes
-    stats_y = subtitle_y + subtitle_font_size + padding
-    stat_height = height // 8
-    stat_spacing = padding // 2
-    
-    for i, stat in enumerate(screenshot_data["stats"]):
-        stat_y = stats_y + i * (stat_height + stat_spacing)
-        
-        # Draw stat box
-        draw.rounded_rectangle(
-            [(padding, stat_y), (width - padding, stat_y + stat_height)],
-            radius=20,
-            fill=(255, 255, 255),
-            outline=PRIMARY_COLOR,
-            width=3
-        )
-        
-        # Draw stat text
-        bbox = draw.textbbox((0, 0), stat, font=stat_font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+    # Draw stat text into the template's boxes
+    stat_height = layout["stat_height"]
+    for stat_y, stat in zip(layout["stat_tops"], stats):
+        text_width, text_height = measure_text(stat, stat_font)
         draw.text(
             ((width - text_width) // 2, 
              stat_y + (stat_height - text_height) // 2),
@@ -159,10 +207,9 @@ def create_placeholder_screenshot(width, height, screenshot_data, index):
     
     # Draw "Screenshot Placeholder" watermark
     watermark = f"Screenshot {index + 1} - Placeholder"
-    bbox = draw.textbbox((0, 0), watermark, font=subtitle_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(watermark, subtitle_font)
     draw.text(
-        ((width - text_width) // 2, height - padding * 2),
+        ((width - text_width) // 2, layout["watermark_y"]),
         watermark,
         fill=(200, 200, 200),
         font=subtitle_font
@@ -171,42 +218,46 @@ def create_placeholder_screenshot(width, height, screenshot_data, index):
     return img
 
 def generate_app_icons():
-    """Generate placeholder app icons."""
+    """Generate placeholder app icons.
+    
+    The icon is drawn once at the largest size and downscaled for the rest.
+    """
     sizes = {
         "ios": 1024,
         "android": 512
     }
+    paths = {
+        "ios": Path("assets/app-store/ios/graphics/app-icon-1024.png"),
+        "android": Path("assets/app-store/android/graphics/icon-512.png")
+    }
+    
+    master_size = max(sizes.values())
+    master = Image.new('RGB', (master_size, master_size), PRIMARY_COLOR)
+    draw = ImageDraw.Draw(master)
+    
+    # Draw "AB" text
+    font = _font(master_size // 3)
+    
+    text = "AB"
+    text_width, text_height = measure_text(text, font)
+    
+    draw.text(
+        ((master_size - text_width) // 2, (master_size - text_height) // 2),
+        text,
+        fill=(255, 255, 255),
+        font=font
+    )
     
     for platform, size in sizes.items():
-        img = Image.new('RGB', (size, size), PRIMARY_COLOR)
-        draw = ImageDraw.Draw(img)
-        
-        # Draw "AB" text
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size // 3)
-        except:
-            font = ImageFont.load_default()
-        
-        text = "AB"
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        draw.text(
-            ((size - text_width) // 2, (size - text_height) // 2),
-            text,
-            fill=(255, 255, 255),
-            font=font
-        )
-        
-        # Save icon
-        if platform == "ios":
-            path = Path("assets/app-store/ios/graphics/app-icon-1024.png")
+        if size == master_size:
+            img = master
         else:
-            path = Path("assets/app-store/android/graphics/icon-512.png")
+            img = master.resize((size, size), Image.LANCZOS)
         
+        # Save icon
+        path = paths[platform]
         path.parent.mkdir(parents=True, exist_ok=True)
-        img.save(path, "PNG")
+        img.save(path, "PNG", **PNG_SAVE_OPTIONS)
         print(f"Generated {path}")
 
 def generate_android_feature_graphic():
@@ -214,17 +265,12 @@ def generate_android_feature_graphic():
     img = Image.new('RGB', (1024, 500), PRIMARY_COLOR)
     draw = ImageDraw.Draw(img)
     
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-        subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 40)
-    except:
-        title_font = ImageFont.load_default()
-        subtitle_font = ImageFont.load_default()
+    title_font = _font(80)
+    subtitle_font = _font(40)
     
     # Draw title
     title = "AdBlock"
-    bbox = draw.textbbox((0, 0), title, font=title_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(title, title_font)
     draw.text(
         ((1024 - text_width) // 2, 150),
         title,
@@ -234,8 +280,7 @@ def generate_android_feature_graphic():
     
     # Draw subtitle
     subtitle = "System-wide Ad Blocker"
-    bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(subtitle, subtitle_font)
     draw.text(
         ((1024 - text_width) // 2, 250),
         subtitle,
@@ -245,8 +290,7 @@ def generate_android_feature_graphic():
     
     # Draw features
     features = "Free • Open Source • Privacy Focused"
-    bbox = draw.textbbox((0, 0), features, font=subtitle_font)
-    text_width = bbox[2] - bbox[0]
+    text_width, _ = measure_text(features, subtitle_font)
     draw.text(
         ((1024 - text_width) // 2, 350),
         features,
@@ -256,32 +300,119 @@ def generate_android_feature_graphic():
     
     path = Path("assets/app-store/android/graphics/feature-graphic.png")
     path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(path, "PNG")
+    img.save(path, "PNG", **PNG_SAVE_OPTIONS)
     print(f"Generated {path}")
 
+def screenshot_tasks():
+    """Build one (master size, screenshot_data, index, targets) task per
+    (aspect group, screenshot), where targets is
+    [(path, (width, height))].
+    
+    Output directories are created here, before tasks are dispatched to
+    workers.
+    """
+    sizes = {}
+    for out_dir, platform_sizes in [
+        ("assets/app-store/ios/screenshots", IOS_SIZES),
+        ("assets/app-store/android/screenshots", ANDROID_SIZES)
+    ]:
+        for size_name, size in platform_sizes.items():
+            sizes[Path(out_dir) / size_name] = size
+    
+    tasks = []
+    for group in group_by_aspect(sizes):
+        master_size = group[0][1]
+        for i, screenshot_data in enumerate(SCREENSHOTS):
+            targets = []
+            for size_dir, size in group:
+                size_dir.mkdir(parents=True, exist_ok=True)
+                targets.append((size_dir / f"screenshot_{i+1}.png", size))
+            tasks.append((master_size, screenshot_data, i, targets))
+    return tasks
+
+def render_and_save(task):
+    """Render a placeholder once and save it at every target size.
+    
+    Encoding runs on threads while the next size is resampled; Pillow
+    releases the GIL for both.
+    """
+    (master_width, master_height), screenshot_data, index, targets = task
+    if HALF_RESOLUTION:
+        master = create_placeholder_screenshot(
+            master_width // 2, master_height // 2, screenshot_data, index
+        ).resize((master_width, master_height), Image.NEAREST)
+    else:
+        master = create_placeholder_screenshot(master_width, master_height, screenshot_data, index)
+    with ThreadPoolExecutor(max_workers=len(targets)) as saver:
+        saves = []
+        for path, (width, height) in targets:
+            if (width, height) == (master_width, master_height):
+                img = master
+            else:
+                img = master.resize((width, height), Image.LANCZOS)
+            saves.append(saver.submit(img.save, path, "PNG", **PNG_SAVE_OPTIONS))
+        for save in saves:
+            save.result()
+    return [path for path, _ in targets]
+
+def _cache_key(task, size):
+    """Key identifying the inputs that determine one target's pixels."""
+    master_size, screenshot_data, index, _ = task
+    inputs = (master_size, size, screenshot_data, index,
+              PRIMARY_COLOR, BACKGROUND_COLOR, TEXT_COLOR, FONT_PATH,
+              HALF_RESOLUTION, CACHE_VERSION)
+    return hashlib.sha256(repr(inputs).encode()).hexdigest()[:12]
+
+def _cache_stamp(task, path, size):
+    """Cache entry for a saved file; includes its mtime so files overwritten by
+    another generator (e.g. generate_app_screenshots.py) are rendered again."""
+    return f"{_cache_key(task, size)}@{os.stat(path).st_mtime_ns}"
+
+def _is_up_to_date(task, cache):
+    for path, size in task[3]:
+        try:
+            if cache.get(str(path)) != _cache_stamp(task, path, size):
+                return False
+        except OSError:
+            return False
+    return True
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    Path(CACHE_FILE).parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
 def main():
     """Generate all placeholder screenshots."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--force', action='store_true',
+                        help='regenerate screenshots even if they are up to date')
+    args = parser.parse_args()
+    
     print("Generating placeholder screenshots...")
+    # Pillow-SIMD builds report a ".postN" version suffix
+    print(f"Using Pillow {PIL.__version__}")
     
-    # Generate iOS screenshots
-    for size_name, (width, height) in IOS_SIZES.items():
-        print(f"\nGenerating iOS {size_name} screenshots...")
-        for i, screenshot_data in enumerate(SCREENSHOTS):
-            img = create_placeholder_screenshot(width, height, screenshot_data, i)
-            path = Path(f"assets/app-store/ios/screenshots/{size_name}/screenshot_{i+1}.png")
-            path.parent.mkdir(parents=True, exist_ok=True)
-            img.save(path, "PNG")
-            print(f"  Generated {path}")
-    
-    # Generate Android screenshots
-    for device_type, (width, height) in ANDROID_SIZES.items():
-        print(f"\nGenerating Android {device_type} screenshots...")
-        for i, screenshot_data in enumerate(SCREENSHOTS):
-            img = create_placeholder_screenshot(width, height, screenshot_data, i)
-            path = Path(f"assets/app-store/android/screenshots/{device_type}/screenshot_{i+1}.png")
-            path.parent.mkdir(parents=True, exist_ok=True)
-            img.save(path, "PNG")
-            print(f"  Generated {path}")
+    # Skip renders whose outputs exist and were made from the same inputs
+    cache = {} if args.force else _load_cache()
+    tasks = [task for task in screenshot_tasks() if not _is_up_to_date(task, cache)]
+    
+    # Render every aspect group in parallel, one process per core
+    print(f"\nGenerating {len(tasks)} screenshot renders...")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for task, paths in zip(tasks, executor.map(render_and_save, tasks, chunksize=2)):
+            for path, size in task[3]:
+                cache[str(path)] = _cache_stamp(task, path, size)
+            for path in paths:
+                print(f"  Generated {path}")
+    _save_cache(cache)
     
     # Generate app icons
     print("\nGenerating app icons...")
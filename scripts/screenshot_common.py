@@ -0,0 +1,47 @@
+"""
+Helpers shared by generate_app_screenshots.py and
+generate_placeholder_screenshots.py.
+Requires: Pillow (pip install -r scripts/requirements.txt)
+"""
+
+from PIL import Image, ImageDraw
+import functools
+
+# Screenshots are regenerated rather than archived, so favour encode speed
+PNG_SAVE_OPTIONS = {"compress_level": 1, "optimize": False}
+
+# Sizes whose aspect ratios differ by at most this fraction are rendered once
+# at the largest size and downscaled; others get their own render
+ASPECT_TOLERANCE = 0.01
+
+# Scratch surface for text measurement only
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+@functools.lru_cache(maxsize=4096)
+def measure_text(text, font):
+    """Return (width, height) of text's bounding box, cached per (text, font).
+    
+    Callers load fonts through a cached _font, so the same size is always the
+    same object.
+    """
+    bbox = _MEASURE_DRAW.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+def group_by_aspect(sizes, tolerance=ASPECT_TOLERANCE):
+    """Group {name: (width, height)} targets with near-identical aspect ratios.
+    
+    Each group is a list of (name, (width, height)), largest first, so the
+    group can be rendered once at its first size and downscaled for the rest.
+    """
+    groups = []
+    by_area = sorted(sizes.items(), key=lambda item: item[1][0] * item[1][1], reverse=True)
+    for name, (width, height) in by_area:
+        for group in groups:
+            group_width, group_height = group[0][1]
+            group_aspect = group_width / group_height
+            if abs(width / height - group_aspect) <= tolerance * group_aspect:
+                group.append((name, (width, height)))
+                break
+        else:
+            groups.append([(name, (width, height))])
+    return groups